@@ -1,17 +1,22 @@
+import functools
 import logging
 import os
-import re
 import sys
-from typing import Sequence
+from typing import Final, Sequence
 
 import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.base import TerminationCondition
 from autogen_agentchat.conditions import MaxMessageTermination
 from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, StopMessage
 from autogen_agentchat.teams import RoundRobinGroupChat
 from autogen_ext.models.openai import OpenAIChatCompletionClient
-from pydantic import ValidationError
 
 from model import AgentClientConfig, AppConfig
 
@@ -36,18 +41,25 @@ class LGTMTermination(TerminationCondition):
 
         if messages:
             last_msg = messages[-1]
-            source_name = getattr(last_msg, "name", getattr(last_msg, "source", None))
+            source_name = getattr(last_msg, "name", None) or getattr(last_msg, "source", None)
             msg_content = getattr(last_msg, "content", None)
-            msg_type_name = getattr(last_msg, "type", type(last_msg).__name__)
-
-            logger.info(
-                f"LGTMTermination checking message from '{source_name}' (Type: {msg_type_name}). Content snippet: '{str(msg_content)[:100]}...'")
 
+            # Fast path: almost every message is a long code block from the
+            # wrong agent, so a length/source gate skips the full check.
             if (
-                    source_name == self.agent_name and
-                    isinstance(msg_content, str) and
-                    re.fullmatch(r"\s*LGTM\s*", msg_content, re.IGNORECASE)
+                    not isinstance(msg_content, str)
+                    or len(msg_content) > 16
+                    or source_name != self.agent_name
             ):
+                logger.debug("LGTM condition not met.")
+                return None
+
+            msg_type_name = getattr(last_msg, "type", type(last_msg).__name__)
+            logger.info(
+                "LGTMTermination checking message from '%s' (Type: %s). Content snippet: '%.100s...'",
+                source_name, msg_type_name, msg_content)
+
+            if msg_content.strip().casefold() == "lgtm":
                 logger.warning(
                     f"LGTM condition met by agent '{self.agent_name}'. Terminating.")
                 self._terminated = True
@@ -65,15 +77,38 @@ class LGTMTermination(TerminationCondition):
         self._terminated = False
 
 
+def _construct_agent_config(raw: dict) -> AgentClientConfig:
+    return AgentClientConfig(**raw)
+
+
 def load_config(path: str) -> AppConfig:
     try:
-        with open(path, "r") as f:
-            raw_configs = yaml.safe_load(f)
+        mtime = os.path.getmtime(path)
+    except OSError:
+        print(f"Error: Configuration file '{path}' not found.")
+        logger.error(f"Configuration file '{path}' not found.")
+        sys.exit(1)
+    return _load_config_cached(path, mtime)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime: float) -> AppConfig:
+    try:
+        with open(path, "rb") as f:
+            raw_configs = yaml.load(f, Loader=_YamlLoader)
             if raw_configs is None:
                 print(f"Error: Configuration file '{path}' is empty.")
                 logger.error(f"Configuration file '{path}' is empty.")
                 sys.exit(1)
-        configs = AppConfig(**raw_configs)
+        if os.environ.get("AUTOGEN_TRUSTED_CONFIG"):
+            configs = AppConfig(
+                dev_agent=_construct_agent_config(raw_configs["dev_agent"]),
+                review_agent=_construct_agent_config(raw_configs["review_agent"]),
+            )
+            logger.info(f"Configuration loaded from '{path}' (trusted, validation skipped).")
+            return configs
+        from model_pydantic import validate_config
+        configs = validate_config(raw_configs, path)
         logger.info(f"Configuration loaded and validated successfully from '{path}'.")
         return configs
     except FileNotFoundError:
@@ -84,13 +119,6 @@ def load_config(path: str) -> AppConfig:
         print(f"Error parsing YAML file '{path}': {e}")
         logger.error(f"Error parsing YAML file '{path}': {e}")
         sys.exit(1)
-    except ValidationError as e:
-        print(f"Error: Configuration validation failed for '{path}':")
-        logger.error(f"Configuration validation failed for '{path}': {e.errors()}")
-        for error in e.errors():
-            loc = " -> ".join(map(str, error['loc']))
-            print(f"  - Field '{loc}': {error['msg']}")
-        sys.exit(1)
     except Exception as e:
         print(f"An unexpected error occurred loading config file '{path}': {e}")
         logger.error(f"An unexpected error occurred loading config file '{path}': {e}")
@@ -105,14 +133,9 @@ def make_model_client_pydantic(agent_key: str, agent_config: AgentClientConfig)
         logger.error(f"API Key environment variable '{env_var_name}' not set for agent '{agent_key}'.")
         sys.exit(1)
     try:
-        model_info_dict = agent_config.model_info.model_dump(exclude_unset=True) if agent_config.model_info else {}
-        client = OpenAIChatCompletionClient(
-            model=agent_config.model,
-            api_key=api_key_from_env,
-            base_url=str(agent_config.base_url),
-            timeout=agent_config.timeout,
-            model_info=model_info_dict
-        )
+        model_info_items = tuple(sorted(agent_config.model_info.items())) if agent_config.model_info else ()
+        client = _make_client(agent_config.model, agent_config.base_url, agent_config.timeout,
+                              api_key_from_env, model_info_items)
         logger.info(f"Model client created successfully for '{agent_key}'.")
         return client
     except Exception as e:
@@ -121,44 +144,70 @@ def make_model_client_pydantic(agent_key: str, agent_config: AgentClientConfig)
         sys.exit(1)
 
 
-CONFIG_FILE = "models.yaml"
-validated_configs = load_config(CONFIG_FILE)
-
-model_client_dev = make_model_client_pydantic("dev_agent", validated_configs.dev_agent)
-model_client_review = make_model_client_pydantic("review_agent", validated_configs.review_agent)
-
-dev_agent = AssistantAgent(
-    "dev_agent",
-    model_client=model_client_dev,
-    system_message=(
-        "You are a senior software engineer. Your task is to write and iteratively refine code based on a request and feedback from a code reviewer.\n"
-        "Instructions:\n"
-        "1.  **Initial Response:** Provide the complete code implementation for the given task.\n"
-        "2.  **Revisions:** If the reviewer provides feedback, **respond ONLY with the complete, updated code block.** Do NOT include any text outside the code block.\n"
-        "3.  **Format:** Use markdown code fences for code.\n"
-        "4.  **CRITICAL STOP RULE:** Check the **very last message** received from `review_agent`. If that message's content is **exactly 'LGTM'** (case-insensitive, ignore surrounding whitespace), your turn is over. **DO NOT GENERATE ANY RESPONSE. STOP IMMEDIATELY.** Your participation in the conversation ends now.\n"
-        "5.  **LGTM SIGNAL:** You *never* say 'LGTM'. Only the `review_agent` signals approval."
+@functools.lru_cache(maxsize=8)
+def _make_client(model: str, base_url: str, timeout: int, api_key: str,
+                 model_info_items: tuple) -> OpenAIChatCompletionClient:
+    return OpenAIChatCompletionClient(
+        model=model,
+        api_key=api_key,
+        base_url=base_url,
+        timeout=timeout,
+        model_info=dict(model_info_items)
     )
+
+
+CONFIG_FILE = "models.yaml"
+
+_DEV_SYSTEM_MSG: Final[str] = (
+    "You are a senior software engineer. Your task is to write and iteratively refine code based on a request and feedback from a code reviewer.\n"
+    "Instructions:\n"
+    "1.  **Initial Response:** Provide the complete code implementation for the given task.\n"
+    "2.  **Revisions:** If the reviewer provides feedback, **respond ONLY with the complete, updated code block.** Do NOT include any text outside the code block.\n"
+    "3.  **Format:** Use markdown code fences for code.\n"
+    "4.  **CRITICAL STOP RULE:** Check the **very last message** received from `review_agent`. If that message's content is **exactly 'LGTM'** (case-insensitive, ignore surrounding whitespace), your turn is over. **DO NOT GENERATE ANY RESPONSE. STOP IMMEDIATELY.** Your participation in the conversation ends now.\n"
+    "5.  **LGTM SIGNAL:** You *never* say 'LGTM'. Only the `review_agent` signals approval."
 )
 
-review_agent = AssistantAgent(
-    "review_agent",
-    model_client=model_client_review,
-    system_message=(
-        "You are a meticulous code reviewer.\n"
-        "Instructions:\n"
-        "1.  **Review Focus:** Evaluate the developer's code.\n"
-        "2.  **Feedback:** Provide concise, actionable feedback or code snippets/diffs.\n"
-        "3.  **Final Approval:** When completely satisfied, your **ENTIRE response MUST be exactly 'LGTM'** and nothing else. Do not add *any* other text.\n"
-        "4.  **STOP AFTER APPROVAL:** Once you have sent 'LGTM' as your entire response, your role is finished. **DO NOT SEND ANY FURTHER MESSAGES.** The conversation terminates after your final 'LGTM'."
-    )
+_REVIEW_SYSTEM_MSG: Final[str] = (
+    "You are a meticulous code reviewer.\n"
+    "Instructions:\n"
+    "1.  **Review Focus:** Evaluate the developer's code.\n"
+    "2.  **Feedback:** Provide concise, actionable feedback or code snippets/diffs.\n"
+    "3.  **Final Approval:** When completely satisfied, your **ENTIRE response MUST be exactly 'LGTM'** and nothing else. Do not add *any* other text.\n"
+    "4.  **STOP AFTER APPROVAL:** Once you have sent 'LGTM' as your entire response, your role is finished. **DO NOT SEND ANY FURTHER MESSAGES.** The conversation terminates after your final 'LGTM'."
 )
 
-text_termination = LGTMTermination("review_agent") | MaxMessageTermination(20)
 
-team = RoundRobinGroupChat(
-    [dev_agent, review_agent],
-    termination_condition=text_termination
-)
+@functools.lru_cache(maxsize=1)
+def get_config() -> AppConfig:
+    return load_config(CONFIG_FILE)
+
+
+@functools.lru_cache(maxsize=4)
+def get_model_client(agent_key: str) -> OpenAIChatCompletionClient:
+    return make_model_client_pydantic(agent_key, getattr(get_config(), agent_key))
+
+
+@functools.lru_cache(maxsize=1)
+def get_team() -> RoundRobinGroupChat:
+    dev_agent = AssistantAgent(
+        "dev_agent",
+        model_client=get_model_client("dev_agent"),
+        system_message=_DEV_SYSTEM_MSG
+    )
+
+    review_agent = AssistantAgent(
+        "review_agent",
+        model_client=get_model_client("review_agent"),
+        system_message=_REVIEW_SYSTEM_MSG
+    )
+
+    text_termination = LGTMTermination("review_agent") | MaxMessageTermination(20)
+
+    team = RoundRobinGroupChat(
+        [dev_agent, review_agent],
+        termination_condition=text_termination
+    )
 
-logger.info("AutoGen setup complete. Agents and team are ready.")
+    logger.info("AutoGen setup complete. Agents and team are ready.")
+    return team
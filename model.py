@@ -1,27 +1,27 @@
+from dataclasses import dataclass
 from typing import Optional
 
-from pydantic import BaseModel, HttpUrl, Field
+from typing_extensions import TypedDict
 
 
-class ModelInfoConfig(BaseModel):
-    family: Optional[str] = None
-    vision: Optional[bool] = None
-    function_calling: Optional[bool] = None
-    json_output: Optional[bool] = None
-    structured_output: Optional[bool] = None
+class ModelInfoConfig(TypedDict, total=False):
+    family: str
+    vision: bool
+    function_calling: bool
+    json_output: bool
+    structured_output: bool
 
-    class Config:
-        extra = 'allow'
 
-
-class AgentClientConfig(BaseModel):
+@dataclass(slots=True)
+class AgentClientConfig:
     model: str
-    api_key: Optional[str] = None
-    base_url: HttpUrl
-    timeout: int = Field(gt=0)
+    base_url: str
+    timeout: int
     model_info: ModelInfoConfig
+    api_key: Optional[str] = None
 
 
-class AppConfig(BaseModel):
+@dataclass(slots=True)
+class AppConfig:
     dev_agent: AgentClientConfig
     review_agent: AgentClientConfig
@@ -0,0 +1,65 @@
+"""Pydantic validation models for models.yaml.
+
+Imported lazily from the validating config path only, so the pydantic
+import and BaseModel metaclass work are not paid on every import of
+autogen_setup. The runtime config types live in model.py as slotted
+dataclasses.
+"""
+import logging
+import sys
+from typing import Optional
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator
+
+from model import AgentClientConfig, AppConfig, ModelInfoConfig
+
+logger = logging.getLogger(__name__)
+
+
+class AgentClientConfigModel(BaseModel):
+    model: str
+    api_key: Optional[str] = None
+    base_url: str
+    timeout: int = Field(gt=0)
+    model_info: ModelInfoConfig
+
+    @field_validator("base_url")
+    @classmethod
+    def _check_base_url(cls, value: str) -> str:
+        if not value.startswith(("http://", "https://")):
+            raise ValueError("base_url must start with http:// or https://")
+        return value
+
+
+class AppConfigModel(BaseModel):
+    dev_agent: AgentClientConfigModel
+    review_agent: AgentClientConfigModel
+
+
+_APP_ADAPTER = TypeAdapter(AppConfigModel)
+
+
+def _to_agent_config(model: AgentClientConfigModel) -> AgentClientConfig:
+    return AgentClientConfig(
+        model=model.model,
+        api_key=model.api_key,
+        base_url=model.base_url,
+        timeout=model.timeout,
+        model_info=model.model_info,
+    )
+
+
+def validate_config(raw_configs: dict, path: str) -> AppConfig:
+    try:
+        validated = _APP_ADAPTER.validate_python(raw_configs)
+    except ValidationError as e:
+        print(f"Error: Configuration validation failed for '{path}':")
+        logger.error(f"Configuration validation failed for '{path}': {e.errors()}")
+        for error in e.errors():
+            loc = " -> ".join(map(str, error['loc']))
+            print(f"  - Field '{loc}': {error['msg']}")
+        sys.exit(1)
+    return AppConfig(
+        dev_agent=_to_agent_config(validated.dev_agent),
+        review_agent=_to_agent_config(validated.review_agent),
+    )
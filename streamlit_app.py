@@ -1,13 +1,40 @@
 import asyncio
 import os
 import sys
+from collections import deque
+from html import escape as _html_escape
 
 import streamlit as st
 from dotenv import load_dotenv
 
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, default=str)
+
 load_dotenv()
 st.set_page_config(page_title="AutoGen Task Runner", layout="wide")
 
+
+@st.cache_resource
+def _get_team():
+    from autogen_setup import get_team
+    return get_team()
+
+
+@st.cache_resource
+def _get_loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    return loop
+
+
 AUTOGEN_SETUP_AVAILABLE = False
 team = None
 setup_file_path = os.path.join(os.path.dirname(__file__), 'autogen_setup.py')
@@ -15,14 +42,14 @@ if not os.path.exists(setup_file_path):
     st.error(f"Error: 'autogen_setup.py' not found.")
 else:
     try:
-        from autogen_setup import team as ag_team
         from autogen_agentchat.base import TaskResult
 
+        ag_team = _get_team()
         if ag_team:
             team = ag_team
             AUTOGEN_SETUP_AVAILABLE = True
         else:
-            st.error("Error: 'team' object not created in 'autogen_setup.py'.")
+            st.error("Error: 'get_team()' did not return a team in 'autogen_setup.py'.")
     except Exception as e_init:
         st.error(f"An unexpected error occurred during initial setup: {e_init}")
 
@@ -40,36 +67,9 @@ if 'final_source_text' not in st.session_state: st.session_state['final_source_t
 if 'conversation_log_list' not in st.session_state: st.session_state['conversation_log_list'] = []
 if 'last_run_error' not in st.session_state: st.session_state['last_run_error'] = None
 
-tab1, tab2 = st.tabs(["Final Result", "Conversation Log"])
-with tab1:
-    st.subheader("Final Agent Response:")
-    st.text_area("Output:", value=st.session_state['final_response_text'], height=300, key="output_area", disabled=True)
-    if st.session_state['final_source_text']:
-        st.caption(
-            f"Source: {st.session_state['final_source_text']} | Stop Reason: {st.session_state['stop_reason_text']}")
-    elif st.session_state['last_run_error']:
-        st.error(f"Last run failed: {st.session_state['last_run_error']}")
-    elif not st.session_state['final_response_text']:
-        st.caption("Run a task to see the result.")
-
-with tab2:
-    st.subheader("Agent Conversation Log")
-    if show_logs_checkbox:
-        if st.session_state['conversation_log_list']:
-            for entry in st.session_state['conversation_log_list']:
-                st.markdown(entry, unsafe_allow_html=True)
-                st.markdown("---")
-        elif st.session_state['last_run_error']:
-            st.warning("Run failed, log incomplete.")
-            st.error(st.session_state['last_run_error'])
-        else:
-            st.info("No log available.")
-    else:
-        st.info("Check 'Show Logs' to view details.")
-
 
-async def run_autogen_stream(task: str, team_instance):
-    conversation_log_entries = []
+async def run_autogen_stream(task: str, team_instance, progress_placeholder=None, show_details=False):
+    conversation_log_entries = deque()
     last_agent_message_object = None
     previous_agent_message_object = None
     final_message_to_display = None
@@ -79,45 +79,72 @@ async def run_autogen_stream(task: str, team_instance):
 
     await team_instance.reset()
 
-    async for message in team_instance.run_stream(task=task):
-        log_entry = ""
-        source_name = getattr(message, 'source', getattr(message, 'name', 'System'))
-        is_agent_message_with_content = False
-
-        if hasattr(message, 'stop_reason'):
-            is_task_result = True
-            message_stop_reason = getattr(message, 'stop_reason', "Unknown")
-            log_entry = f"**System:** Task finished. Stop Reason: {message_stop_reason}"
-            stop_reason = message_stop_reason or "Completed"
-
-        elif hasattr(message, 'content'):
-            is_agent_source = source_name not in ['user', 'System', 'UserProxyAgent']
-            if is_agent_source:
-                is_agent_message_with_content = True
-
-            message_content = getattr(message, 'content')
-            if isinstance(message_content, str):
-                escaped_content = message_content.replace("<", "<").replace(">", ">")
-                log_entry = f"**{source_name}:**\n```\n{escaped_content}\n```" if "```" in escaped_content else f"**{source_name}:**\n{escaped_content}"
-            elif message_content is not None:
-                log_entry = f"**{source_name}:** `({type(message_content).__name__} content)`"
-            else:
-                role = getattr(message, 'role', None)
-                log_entry = f"**{source_name}:** `(Role: {role} - Content is None)`"
+    _append = conversation_log_entries.append
 
-        else:
-            event_type_name = type(message).__name__
-            log_entry = f"**{source_name}:** `({event_type_name})`"
-
-        if log_entry:
-            conversation_log_entries.append(log_entry)
-
-        if is_agent_message_with_content:
-            previous_agent_message_object = last_agent_message_object
-            last_agent_message_object = message
+    stream = team_instance.run_stream(task=task)
+    try:
+        async for message in stream:
+            log_entry = None
+            source_name = getattr(message, 'source', None) or getattr(message, 'name', None) or 'System'
+            is_agent_message_with_content = False
+
+            if hasattr(message, 'stop_reason'):
+                is_task_result = True
+                message_stop_reason = getattr(message, 'stop_reason', "Unknown")
+                log_entry = ("System", f"Task finished. Stop Reason: {message_stop_reason}", "system")
+                stop_reason = message_stop_reason or "Completed"
+
+            elif hasattr(message, 'content'):
+                is_agent_source = source_name not in ['user', 'System', 'UserProxyAgent']
+                if is_agent_source:
+                    is_agent_message_with_content = True
+
+                message_content = getattr(message, 'content')
+                if isinstance(message_content, str):
+                    log_entry = (source_name, message_content, "text")
+                elif message_content is not None:
+                    log_entry = (source_name, message_content, "object")
+                else:
+                    role = getattr(message, 'role', None)
+                    log_entry = (source_name, f"(Role: {role} - Content is None)", "note")
 
-        if is_task_result:
-            break
+            else:
+                event_type_name = type(message).__name__
+                log_entry = (source_name, f"({event_type_name})", "note")
+
+            if log_entry:
+                _append(log_entry)
+                if progress_placeholder is not None:
+                    if show_details:
+                        progress_placeholder.markdown(format_log_entry(log_entry), unsafe_allow_html=True)
+                    else:
+                        progress_placeholder.caption(
+                            f"{len(conversation_log_entries)} messages streamed - last from {source_name}")
+
+            if is_agent_message_with_content:
+                previous_agent_message_object = last_agent_message_object
+                last_agent_message_object = message
+
+            if is_task_result:
+                break
+
+            # Short-circuit: once the reviewer replies with a bare LGTM the
+            # run is decided, so stop consuming the stream instead of waiting
+            # for the group-chat machinery to emit its final TaskResult.
+            if (
+                    is_agent_message_with_content
+                    and source_name == "review_agent"
+                    and isinstance(message_content, str)
+                    and len(message_content) <= 16
+                    and message_content.strip().casefold() == "lgtm"
+            ):
+                stop_reason = "LGTM received from review_agent."
+                break
+    finally:
+        # Close the generator deterministically; run_stream only clears its
+        # running flag in a finally that needs loop iterations GC-driven
+        # finalization never gets, and the team/loop are cached across runs.
+        await stream.aclose()
 
     lgtm_termination_occurred = "LGTM received" in stop_reason
 
@@ -134,8 +161,8 @@ async def run_autogen_stream(task: str, team_instance):
         final_content_raw = getattr(final_message_to_display, 'content', '[No content found in selected message]')
         final_agent_message_content = str(final_content_raw) if not isinstance(final_content_raw,
                                                                                str) else final_content_raw
-        final_agent_name = getattr(final_message_to_display, 'source',
-                                   getattr(final_message_to_display, 'name', 'Unknown'))
+        final_agent_name = (getattr(final_message_to_display, 'source', None)
+                            or getattr(final_message_to_display, 'name', None) or 'Unknown')
     else:
         final_agent_message_content = "[No agent response recorded before termination]"
         if is_task_result:
@@ -145,19 +172,30 @@ async def run_autogen_stream(task: str, team_instance):
     # print(f"DEBUG: Final display source: {final_agent_name}")
     # print(f"DEBUG: Stop Reason: {stop_reason}")
 
-    return conversation_log_entries, final_agent_message_content, final_agent_name, stop_reason
+    return list(conversation_log_entries), final_agent_message_content, final_agent_name, stop_reason
+
+
+def format_log_entry(entry) -> str:
+    source_name, content, kind = entry
+    if kind == "text":
+        escaped_content = _html_escape(content, quote=False)
+        if "```" in escaped_content:
+            return f"**{source_name}:**\n```\n{escaped_content}\n```"
+        return f"**{source_name}:**\n{escaped_content}"
+    if kind == "system":
+        return f"**{source_name}:** {content}"
+    if kind == "object":
+        try:
+            return f"**{source_name}:**\n```json\n{_json_dumps(content)}\n```"
+        except TypeError:
+            return f"**{source_name}:** `({type(content).__name__} content)`"
+    return f"**{source_name}:** `{content}`"
 
 
 if run_button and user_task_input and AUTOGEN_SETUP_AVAILABLE and team:
     with st.spinner('Agents are working... Please wait.'):
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_closed():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        loop = _get_loop()
+        progress_placeholder = st.empty()
 
         try:
             st.session_state['conversation_log_list'] = []
@@ -167,7 +205,9 @@ if run_button and user_task_input and AUTOGEN_SETUP_AVAILABLE and team:
             st.session_state['last_run_error'] = None
 
             log_list, final_text, final_source, stop_reason_val = loop.run_until_complete(
-                run_autogen_stream(user_task_input, team)
+                run_autogen_stream(user_task_input, team,
+                                   progress_placeholder=progress_placeholder,
+                                   show_details=show_logs_checkbox)
             )
 
             st.session_state['conversation_log_list'] = log_list
@@ -183,4 +223,31 @@ if run_button and user_task_input and AUTOGEN_SETUP_AVAILABLE and team:
 
             traceback.print_exc()
 
-        st.rerun()
+        progress_placeholder.empty()
+
+tab1, tab2 = st.tabs(["Final Result", "Conversation Log"])
+with tab1:
+    st.subheader("Final Agent Response:")
+    st.text_area("Output:", value=st.session_state['final_response_text'], height=300, key="output_area", disabled=True)
+    if st.session_state['final_source_text']:
+        st.caption(
+            f"Source: {st.session_state['final_source_text']} | Stop Reason: {st.session_state['stop_reason_text']}")
+    elif st.session_state['last_run_error']:
+        st.error(f"Last run failed: {st.session_state['last_run_error']}")
+    elif not st.session_state['final_response_text']:
+        st.caption("Run a task to see the result.")
+
+with tab2:
+    st.subheader("Agent Conversation Log")
+    if show_logs_checkbox:
+        if st.session_state['conversation_log_list']:
+            for entry in st.session_state['conversation_log_list']:
+                st.markdown(format_log_entry(entry), unsafe_allow_html=True)
+                st.markdown("---")
+        elif st.session_state['last_run_error']:
+            st.warning("Run failed, log incomplete.")
+            st.error(st.session_state['last_run_error'])
+        else:
+            st.info("No log available.")
+    else:
+        st.info("Check 'Show Logs' to view details.")